@@ -10,13 +10,14 @@ from pathlib import Path
 # Ensure project root on path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-import yaml
 from dotenv import load_dotenv
 
 from src.storage import RawStore, InsightStore
 from src.fetcher import run_fetch
 from src.analyzer import run_analyze
 from src.delivery.interface import load_plugins_from_config
+from src.util.config import load_config
+from src.util.llm_cache import LLMCache
 
 load_dotenv()
 
@@ -28,14 +29,6 @@ logging.basicConfig(
 logger = logging.getLogger("run_daily")
 
 
-def load_config() -> dict:
-    config_path = Path(__file__).parent / "config.yaml"
-    if not config_path.exists():
-        return {}
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
-
-
 def main() -> None:
     config = load_config()
     storage_cfg = config.get("storage") or {}
@@ -53,12 +46,25 @@ def main() -> None:
 
     # 2) Analyze
     analyzer_cfg = config.get("analyzer") or {}
+    cache_cfg = analyzer_cfg.get("llm_cache") or {}
+    llm_cache = None
+    if cache_cfg.get("enabled", True):
+        llm_cache = LLMCache(
+            db_path=cache_cfg.get("path", "data/llm_cache.db"),
+            ttl_seconds=float(cache_cfg.get("ttl_days", 7)) * 24 * 3600,
+        )
     n_analyzed = run_analyze(
         raw_store,
         insight_store,
         model=analyzer_cfg.get("model"),
         max_items_per_run=analyzer_cfg.get("max_items_per_run", 30),
         summary_max_chars=analyzer_cfg.get("summary_max_chars", 500),
+        concurrency=analyzer_cfg.get("concurrency"),
+        max_requests_per_minute=analyzer_cfg.get("max_requests_per_minute"),
+        max_tokens_per_minute=analyzer_cfg.get("max_tokens_per_minute"),
+        llm_cache=llm_cache,
+        batch_size=analyzer_cfg.get("batch_size", 1),
+        strict_json=analyzer_cfg.get("strict_json", False),
     )
     logger.info("Analyzed %d new items", n_analyzed)
 
@@ -1 +1 @@
-# Insight-mode: AI 洞察智能体
+# Insight-mode: AI 洞察智能体
@@ -1,129 +1,504 @@
-"""
-Analyzer: read raw items from RawStore, call LLM for opportunities/directions/innovations,
-write results to InsightStore. Skips raw items that already have an insight.
-"""
-import json
-import logging
-import os
-from typing import Any
-
-from openai import OpenAI
-from dotenv import load_dotenv
-
-from src.storage import RawStore, InsightStore
-
-load_dotenv()
-logger = logging.getLogger(__name__)
-
-SYSTEM_PROMPT = """你是一名专业分析师。请根据每条信息的类型采用自适应的分析流程，根据内容自行组织输出结构。
-
-## 分析流程示例
-
-**若为学术论文：**
-1. 先简要总结论文内容与核心贡献；
-2. 描述论文创新点（方法、实验或理论上的突破）；
-3. 分析可能的改进策略或技术演进方向；
-4. 分析商业落地可能性以及可行的商业计划或应用场景。
-用你认为合适的中文键名组织成 JSON（如：总结、创新点、改进方向、商业计划 等）。
-
-**若为新闻或资讯：**
-1. 先总结新闻要点；
-2. 突出值得关注的重点（政策、产品、融资、人事等）；
-3. 描述潜在重要信息（如市场预测、行业动向、大众舆情、竞争格局等）。
-用你认为合适的中文键名组织成 JSON（如：总结、重点、市场预测 等）。
-
-**若为其他类型（博客、报告、产品发布等）：**
-先总结内容，再分析关键信息与潜在影响，用合适的中文键名组织成 JSON。
-
-## 输出要求
-
-请仅回复一个 JSON 对象，键名使用中文，键和结构由你根据分析内容自行决定。值可以是字符串、字符串数组或嵌套对象。每条描述保持简洁（建议 80 字符以内）。"""
-
-
-def _parse_llm_response(text: str) -> dict[str, Any]:
-    """Extract JSON from model response (may be wrapped in markdown). Returns dict with arbitrary structure."""
-    text = text.strip()
-    if "```" in text:
-        parts = text.split("```")
-        for p in parts:
-            if "{" in p:
-                text = p.strip()
-                if text.startswith("json"):
-                    text = text[4:].strip()
-                break
-    start = text.find("{")
-    if start >= 0:
-        depth = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    try:
-                        return json.loads(text[start : i + 1])
-                    except json.JSONDecodeError:
-                        break
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        return {}
-
-
-def analyze_one(
-    client: OpenAI,
-    model: str,
-    title: str,
-    url: str,
-    summary: str,
-    summary_max_chars: int = 500,
-) -> dict[str, Any]:
-    """Call LLM for one raw item; return analysis as a dict (structure determined by model)."""
-    summary_trim = (summary or "")[:summary_max_chars]
-    user = f"Title: {title}\nURL: {url}\nAbstract/Summary: {summary_trim}"
-    resp = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user},
-        ],
-        temperature=0.3,
-    )
-    content = (resp.choices[0].message.content or "").strip()
-    return _parse_llm_response(content)
-
-
-def run_analyze(
-    raw_store: RawStore,
-    insight_store: InsightStore,
-    model: str | None = None,
-    max_items_per_run: int = 30,
-    summary_max_chars: int = 500,
-    api_key: str | None = None,
-    base_url: str | None = None,
-) -> int:
-    """
-    Load raw items not yet analyzed, call LLM for each, write to InsightStore.
-    Returns count of new insights written.
-    """
-    model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.warning("OPENAI_API_KEY not set; analyzer will not run")
-        return 0
-    client = OpenAI(api_key=api_key, base_url=os.getenv("OPENAI_BASE_URL") or base_url)
-    analyzed_ids = insight_store.get_analyzed_raw_item_ids()
-    raw_items = raw_store.list_since(limit=max_items_per_run * 2)
-    to_process = [r for r in raw_items if r.id is not None and r.id not in analyzed_ids][:max_items_per_run]
-    count = 0
-    for item in to_process:
-        try:
-            data = analyze_one(
-                client, model, item.title, item.url, item.summary, summary_max_chars
-            )
-            insight_store.insert(item.id, data)
-            count += 1
-            logger.info("Analyzed raw_item_id=%s", item.id)
-        except Exception as e:
-            logger.exception("Analyzer failed for raw_item_id=%s: %s", item.id, e)
-    return count
+"""
+Analyzer: read raw items from RawStore, call LLM for opportunities/directions/innovations,
+write results to InsightStore. Skips raw items that already have an insight.
+LLM calls are I/O-bound, so items are analyzed concurrently via asyncio + AsyncOpenAI,
+bounded by a semaphore to avoid hammering the provider.
+"""
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+from dotenv import load_dotenv
+
+from src.storage import RawStore, InsightStore
+from src.util.llm_cache import LLMCache
+from src.util.ratelimit import AsyncLeakyBucket, detect_profile, estimate_tokens
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """你是一名专业分析师。请根据每条信息的类型采用自适应的分析流程，根据内容自行组织输出结构。
+
+## 分析流程示例
+
+**若为学术论文：**
+1. 先简要总结论文内容与核心贡献；
+2. 描述论文创新点（方法、实验或理论上的突破）；
+3. 分析可能的改进策略或技术演进方向；
+4. 分析商业落地可能性以及可行的商业计划或应用场景。
+用你认为合适的中文键名组织成 JSON（如：总结、创新点、改进方向、商业计划 等）。
+
+**若为新闻或资讯：**
+1. 先总结新闻要点；
+2. 突出值得关注的重点（政策、产品、融资、人事等）；
+3. 描述潜在重要信息（如市场预测、行业动向、大众舆情、竞争格局等）。
+用你认为合适的中文键名组织成 JSON（如：总结、重点、市场预测 等）。
+
+**若为其他类型（博客、报告、产品发布等）：**
+先总结内容，再分析关键信息与潜在影响，用合适的中文键名组织成 JSON。
+
+## 输出要求
+
+请仅回复一个 JSON 对象，键名使用中文，键和结构由你根据分析内容自行决定。值可以是字符串、字符串数组或嵌套对象。每条描述保持简洁（建议 80 字符以内）。"""
+
+# Appended to SYSTEM_PROMPT when several items are packed into one request;
+# amortizes the system-prompt tokens across the batch.
+BATCH_PROMPT_SUFFIX = """
+
+## 批量输入
+
+用户将一次给出多条编号为 [0]、[1]…… 的信息。请仅回复一个 JSON 数组，长度与条数相同，
+第 i 个元素为 [i] 的分析 JSON 对象，单个对象的结构要求同上。"""
+
+
+# Markdown code fence around the JSON payload (```json ... ``` or plain ```).
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+# C-accelerated decoder used to pull the first balanced JSON object out of prose.
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_loads(text: str) -> Any:
+    """orjson when available (C, fast on CJK payloads), stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _parse_llm_response(text: str) -> dict[str, Any]:
+    """Extract JSON from model response (may be wrapped in markdown). Returns dict with arbitrary structure."""
+    text = text.strip()
+    # Try each fenced block that could hold an object; responses sometimes
+    # carry non-JSON fences (```text ...```) ahead of the JSON one.
+    for m in _FENCE_RE.finditer(text):
+        candidate = m.group(1).strip()
+        if "{" not in candidate:
+            continue
+        try:
+            obj = _json_loads(candidate)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+    try:
+        obj = _json_loads(text)
+        if isinstance(obj, dict):
+            return obj
+    except ValueError:
+        pass
+    # Recovery: prose around the JSON — decode the first balanced object in the
+    # full response via the C decoder instead of a per-character Python scan.
+    start = text.find("{")
+    while start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return {}
+
+
+# Process-wide client singleton: one connection pool (and its TLS handshakes)
+# shared by every request in the run instead of a fresh client per call site.
+# The pool's connections are bound to the event loop they were opened on, so
+# the singleton is keyed on the running loop too: a later run_analyze() call
+# (fresh asyncio.run, fresh loop) gets a fresh client instead of dead sockets.
+_client: AsyncOpenAI | None = None
+_client_key: tuple[str | None, str | None] | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+async def _get_client(api_key: str, base_url: str | None, concurrency: int = 8) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client, creating it on first use and
+    replacing it when the credentials or the running loop change.
+    max_retries=0 — retries are owned by _create_with_retry. When httpx is
+    importable, the pool is sized to the analyzer's concurrency.
+    """
+    global _client, _client_key, _client_loop
+    key = (api_key, base_url)
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client_key == key and _client_loop is loop:
+        return _client
+    if _client is not None:
+        # Release the stale pool before replacing it. Best-effort: a client
+        # whose loop is already closed cannot shut down cleanly from here.
+        try:
+            await _client.close()
+        except Exception:
+            pass
+        _client = None
+    http_client = None
+    if httpx is not None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=concurrency * 2,
+                max_keepalive_connections=concurrency * 2,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    _client = AsyncOpenAI(
+        api_key=api_key, base_url=base_url, max_retries=0, http_client=http_client
+    )
+    _client_key = key
+    _client_loop = loop
+    return _client
+
+
+@atexit.register
+def _close_client() -> None:
+    if _client is not None:
+        try:
+            asyncio.run(_client.close())
+        except Exception:
+            pass
+
+
+def _input_hash(model: str, title: str, url: str, summary_trim: str) -> str:
+    """SHA-256 over the exact LLM input; identical inputs reuse the stored analysis."""
+    return hashlib.sha256(f"{model}|{title}|{url}|{summary_trim}".encode()).hexdigest()
+
+
+# Transient errors worth retrying; anything else (auth, bad request) fails fast.
+_RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+_RETRY_MAX_ATTEMPTS = 6
+_RETRY_MAX_WAIT = 60.0
+
+
+def _retry_after_seconds(e: Exception) -> float | None:
+    """Honor the provider's Retry-After header when present (seconds)."""
+    response = getattr(e, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after") if response.headers else None
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _create_with_retry(
+    client: AsyncOpenAI,
+    limiter: AsyncLeakyBucket | None = None,
+    estimated_tokens: int = 0,
+    **kwargs: Any,
+):
+    """
+    chat.completions.create with exponential backoff + jitter on transient
+    errors (429/5xx/timeouts); re-raises on exhaustion or permanent errors.
+    The limiter is re-acquired before every attempt so retries count against
+    the RPM/TPM budget too — exactly the situation where the provider is
+    already pushing back.
+    """
+    for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+        if limiter is not None:
+            await limiter.acquire(estimated_tokens)
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except _RETRYABLE_ERRORS as e:
+            if attempt >= _RETRY_MAX_ATTEMPTS:
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = random.uniform(1.0, min(_RETRY_MAX_WAIT, 2.0 ** attempt))
+            logger.warning(
+                "LLM call failed (%s), retry %d/%d in %.1fs",
+                type(e).__name__, attempt, _RETRY_MAX_ATTEMPTS - 1, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+async def analyze_one_async(
+    client: AsyncOpenAI,
+    model: str,
+    title: str,
+    url: str,
+    summary: str,
+    summary_max_chars: int = 500,
+    limiter: AsyncLeakyBucket | None = None,
+    cache: LLMCache | None = None,
+    strict_json: bool = False,
+) -> dict[str, Any]:
+    """
+    Call LLM for one raw item; return analysis as a dict (structure determined by model).
+    strict_json requests the provider's JSON mode (response_format=json_object) so the
+    response is guaranteed pure JSON and parsing never needs the recovery path.
+    """
+    user = f"Title: {title}\nURL: {url}\nAbstract/Summary: {(summary or '')[:summary_max_chars]}"
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user},
+    ]
+    temperature = 0.3
+    cache_key = None
+    if cache is not None:
+        cache_key = LLMCache.cache_key(model, messages, temperature)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _parse_llm_response(cached["content"])
+    kwargs: dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+    if strict_json:
+        kwargs["response_format"] = {"type": "json_object"}
+    resp = await _create_with_retry(
+        client,
+        limiter=limiter,
+        estimated_tokens=estimate_tokens(SYSTEM_PROMPT, user),
+        **kwargs,
+    )
+    content = (resp.choices[0].message.content or "").strip()
+    if cache is not None and cache_key is not None:
+        cache.set(cache_key, {"content": content})
+    return _parse_llm_response(content)
+
+
+def _parse_llm_array(text: str, expected: int) -> list[dict[str, Any]] | None:
+    """Parse a JSON-array batch response; None if it is not an array of `expected` objects."""
+    text = text.strip()
+    # Same fence handling as _parse_llm_response: try every block that could
+    # hold an array, then the whole text, then raw_decode over the original.
+    for m in _FENCE_RE.finditer(text):
+        candidate = m.group(1).strip()
+        if "[" not in candidate:
+            continue
+        try:
+            obj = _json_loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(obj, list) and len(obj) == expected:
+            return [d if isinstance(d, dict) else {} for d in obj]
+    try:
+        obj = _json_loads(text)
+    except ValueError:
+        obj = None
+        start = text.find("[")
+        while start >= 0:
+            try:
+                obj, _ = _JSON_DECODER.raw_decode(text, start)
+                break
+            except json.JSONDecodeError:
+                start = text.find("[", start + 1)
+    if not isinstance(obj, list) or len(obj) != expected:
+        return None
+    return [d if isinstance(d, dict) else {} for d in obj]
+
+
+async def analyze_batch_async(
+    client: AsyncOpenAI,
+    model: str,
+    batch: list[tuple[str, str, str]],
+    limiter: AsyncLeakyBucket | None = None,
+    cache: LLMCache | None = None,
+) -> list[dict[str, Any]] | None:
+    """
+    Analyze several (title, url, summary_trim) items in one completion request.
+    Returns per-item dicts in input order, or None if the response could not be
+    parsed as a matching JSON array (caller falls back to per-item calls).
+    """
+    numbered = "\n\n".join(
+        f"[{i}] Title: {title}\nURL: {url}\nAbstract/Summary: {summary_trim}"
+        for i, (title, url, summary_trim) in enumerate(batch)
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT + BATCH_PROMPT_SUFFIX},
+        {"role": "user", "content": numbered},
+    ]
+    temperature = 0.3
+    cache_key = None
+    if cache is not None:
+        cache_key = LLMCache.cache_key(model, messages, temperature)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _parse_llm_array(cached["content"], len(batch))
+    resp = await _create_with_retry(
+        client,
+        limiter=limiter,
+        estimated_tokens=estimate_tokens(SYSTEM_PROMPT, BATCH_PROMPT_SUFFIX, numbered),
+        model=model,
+        messages=messages,
+        temperature=temperature,
+    )
+    content = (resp.choices[0].message.content or "").strip()
+    parsed = _parse_llm_array(content, len(batch))
+    if parsed is not None and cache is not None and cache_key is not None:
+        cache.set(cache_key, {"content": content})
+    return parsed
+
+
+async def run_analyze_async(
+    raw_store: RawStore,
+    insight_store: InsightStore,
+    model: str | None = None,
+    max_items_per_run: int = 30,
+    summary_max_chars: int = 500,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    concurrency: int | None = None,
+    max_requests_per_minute: int | None = None,
+    max_tokens_per_minute: int | None = None,
+    llm_cache: LLMCache | None = None,
+    batch_size: int = 1,
+    strict_json: bool = False,
+) -> int:
+    """
+    Load raw items not yet analyzed, call LLM concurrently (bounded by `concurrency`
+    and an RPM/TPM sliding-window limiter), write to InsightStore.
+    concurrency / RPM / TPM left as None are seeded from the provider profile
+    matched against the base URL (see src.util.ratelimit.PROVIDER_PROFILES).
+    batch_size > 1 packs that many items per completion request (amortizes the
+    system prompt; falls back to per-item calls if the batch response is unusable).
+    strict_json enables provider JSON mode on per-item calls (only for providers
+    that support response_format=json_object).
+    Returns count of new insights written.
+    """
+    model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.warning("OPENAI_API_KEY not set; analyzer will not run")
+        return 0
+    base_url = os.getenv("OPENAI_BASE_URL") or base_url
+    profile = detect_profile(base_url)
+    concurrency = concurrency or profile.max_concurrency
+    max_requests_per_minute = max_requests_per_minute or profile.rpm
+    max_tokens_per_minute = max_tokens_per_minute or profile.tpm
+    client = await _get_client(api_key, base_url, concurrency=concurrency)
+    to_process = [r for r in raw_store.list_unanalyzed(limit=max_items_per_run) if r.id is not None]
+    sem = asyncio.Semaphore(max(1, concurrency))
+    limiter = AsyncLeakyBucket(rpm=max_requests_per_minute, tpm=max_tokens_per_minute)
+
+    # Dedup: identical (model, title, url, summary) inputs reuse the stored
+    # analysis instead of paying another LLM round-trip.
+    results: list[tuple[Any, dict[str, Any] | None, str | None]] = []
+    pending: list[tuple[Any, str, str]] = []  # (item, summary_trim, input_hash)
+    for item in to_process:
+        summary_trim = (item.summary or "")[:summary_max_chars]
+        input_hash = _input_hash(model, item.title, item.url, summary_trim)
+        cached = insight_store.get_data_by_hash(input_hash)
+        if cached is not None:
+            logger.info("Analyzer cache hit for raw_item_id=%s", item.id)
+            results.append((item, cached, None))
+        else:
+            pending.append((item, summary_trim, input_hash))
+
+    async def _item_task(entry):
+        item, _, input_hash = entry
+        async with sem:
+            try:
+                data = await analyze_one_async(
+                    client, model, item.title, item.url, item.summary, summary_max_chars,
+                    limiter=limiter, cache=llm_cache, strict_json=strict_json,
+                )
+                return [(item, data, input_hash)]
+            except Exception as e:
+                logger.exception("Analyzer failed for raw_item_id=%s: %s", item.id, e)
+                return [(item, None, None)]
+
+    async def _batch_task(entries):
+        batch = [(item.title, item.url, summary_trim) for item, summary_trim, _ in entries]
+        async with sem:
+            try:
+                datas = await analyze_batch_async(
+                    client, model, batch, limiter=limiter, cache=llm_cache
+                )
+            except Exception as e:
+                logger.exception(
+                    "Analyzer batch failed for raw_item_ids=%s: %s",
+                    [item.id for item, _, _ in entries], e,
+                )
+                datas = None
+        if datas is None:
+            # Batch response unusable — fall back to one call per item.
+            out = []
+            for entry in entries:
+                out.extend(await _item_task(entry))
+            return out
+        return [
+            (item, data, input_hash)
+            for (item, _, input_hash), data in zip(entries, datas)
+        ]
+
+    if batch_size > 1:
+        tasks = [
+            asyncio.create_task(_batch_task(pending[i : i + batch_size]))
+            for i in range(0, len(pending), batch_size)
+        ]
+    else:
+        tasks = [asyncio.create_task(_item_task(entry)) for entry in pending]
+    gathered = await asyncio.gather(*tasks, return_exceptions=True)
+    for res in gathered:
+        if isinstance(res, BaseException):
+            logger.error("Analyzer task failed: %s", res)
+            continue
+        results.extend(res)
+    # Flush all completed analyses in one transaction instead of a commit per item.
+    to_insert: list[tuple[int, dict[str, Any]]] = []
+    for item, data, input_hash in results:
+        if data is None:
+            continue
+        to_insert.append((item.id, data))
+        if input_hash is not None:
+            insight_store.put_data_by_hash(input_hash, data)
+        logger.info("Analyzed raw_item_id=%s", item.id)
+    count = len(insight_store.insert_many(to_insert))
+    if llm_cache is not None:
+        logger.info("LLM cache: %d hits / %d misses", llm_cache.hits, llm_cache.misses)
+    return count
+
+
+def run_analyze(
+    raw_store: RawStore,
+    insight_store: InsightStore,
+    model: str | None = None,
+    max_items_per_run: int = 30,
+    summary_max_chars: int = 500,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    concurrency: int | None = None,
+    max_requests_per_minute: int | None = None,
+    max_tokens_per_minute: int | None = None,
+    llm_cache: LLMCache | None = None,
+    batch_size: int = 1,
+    strict_json: bool = False,
+) -> int:
+    """Sync wrapper around run_analyze_async (entry point for run_daily.py)."""
+    return asyncio.run(
+        run_analyze_async(
+            raw_store,
+            insight_store,
+            model=model,
+            max_items_per_run=max_items_per_run,
+            summary_max_chars=summary_max_chars,
+            api_key=api_key,
+            base_url=base_url,
+            concurrency=concurrency,
+            max_requests_per_minute=max_requests_per_minute,
+            max_tokens_per_minute=max_tokens_per_minute,
+            llm_cache=llm_cache,
+            batch_size=batch_size,
+            strict_json=strict_json,
+        )
+    )
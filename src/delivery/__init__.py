@@ -1 +1 @@
-# Delivery layer (pluggable): report, query_api, email, etc.
+# Delivery layer (pluggable): report, query_api, email, etc.
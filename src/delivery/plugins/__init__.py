@@ -1 +1 @@
-# Delivery plugins: email (current), report, query_api, feishu, notion (later)
+# Delivery plugins: email (current), report, query_api, feishu, notion (later)
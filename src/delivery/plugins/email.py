@@ -1,121 +1,149 @@
-"""
-Email delivery plugin: read insights from InsightStore, send summary via SMTP.
-Batch-type: called once per pipeline run.
-"""
-import logging
-import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any
-
-from src.delivery.interface import DeliveryPlugin
-
-logger = logging.getLogger(__name__)
-
-
-def _parse_recipients(raw: str | list[str] | None) -> list[str]:
-    """Parse EMAIL_TO / email_to into list of addresses (comma-separated string or list)."""
-    if not raw:
-        return []
-    if isinstance(raw, list):
-        return [s.strip() for s in raw if s and s.strip()]
-    return [s.strip() for s in str(raw).split(",") if s.strip()]
-
-
-def _format_value(v: Any) -> str:
-    """Format a single value for email: list -> join, str -> as is, dict -> one line summary."""
-    if isinstance(v, list):
-        return ", ".join(str(x) for x in v) if v else "-"
-    if isinstance(v, str):
-        return v or "-"
-    if isinstance(v, dict):
-        return "; ".join(f"{k}: {_format_value(val)}" for k, val in v.items()) or "-"
-    return str(v) if v is not None else "-"
-
-
-def _build_body(insights: list[Any], raw_store: Any | None = None) -> str:
-    """Build plain text email body from insights (flexible data structure)."""
-    lines = ["# AI 洞察 日报\n"]
-    for i, ins in enumerate(insights, 1):
-        lines.append(f"## 条目 {i}\n")
-        data = getattr(ins, "data", {}) or {}
-        for key, value in data.items():
-            label = key.replace("_", " ").strip()
-            lines.append(f"- **{label}**: {_format_value(value)}\n")
-        if raw_store and getattr(ins, "raw_item_id", None):
-            raw = raw_store.get_by_id(ins.raw_item_id)
-            if raw:
-                lines.append(f"- **链接**: {raw.url}\n")
-        lines.append("")
-    return "\n".join(lines)
-
-
-class EmailDeliveryPlugin(DeliveryPlugin):
-    def __init__(self):
-        self._plugin_id = "email"
-
-    @property
-    def plugin_id(self) -> str:
-        return self._plugin_id
-
-    def deliver(
-        self,
-        insight_store: Any,
-        config: dict[str, Any] | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> bool:
-        config = config or {}
-        context = context or {}
-        raw_store = context.get("raw_store")
-        smtp_host = os.getenv("SMTP_HOST") or config.get("smtp_host")
-        smtp_port = int(os.getenv("SMTP_PORT", "587") or config.get("smtp_port", "587"))
-        smtp_user = os.getenv("SMTP_USER") or config.get("smtp_user")
-        smtp_password = os.getenv("SMTP_PASSWORD") or config.get("smtp_password")
-        smtp_from = os.getenv("SMTP_FROM") or config.get("smtp_from") or smtp_user
-        email_to_raw = os.getenv("EMAIL_TO") or config.get("email_to")
-        recipients = _parse_recipients(email_to_raw)
-        subject_prefix = config.get("subject_prefix", "[AI 洞察]")
-        max_insights = int(config.get("max_insights", 100))
-        if not all([smtp_host, smtp_user, smtp_password]) or not recipients:
-            logger.warning("Email plugin: missing SMTP_HOST/USER/PASSWORD or EMAIL_TO")
-            return False
-        insights = insight_store.list_since(limit=max_insights)
-        if not insights:
-            logger.info("Email plugin: no insights to send")
-            return True
-        body = _build_body(insights, raw_store)
-        subject = f"{subject_prefix} 日报 {len(insights)} 条"
-        use_ssl = smtp_port == 465
-        try:
-            if use_ssl:
-                with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-                    server.login(smtp_user, smtp_password)
-                    for to in recipients:
-                        msg = MIMEMultipart("alternative")
-                        msg["Subject"] = subject
-                        msg["From"] = smtp_from
-                        msg["To"] = to
-                        msg.attach(MIMEText(body, "plain", "utf-8"))
-                        server.sendmail(smtp_from, [to], msg.as_string())
-                        logger.info("Email plugin: sent to %s", to)
-            else:
-                with smtplib.SMTP(smtp_host, smtp_port) as server:
-                    server.starttls()
-                    server.login(smtp_user, smtp_password)
-                    for to in recipients:
-                        msg = MIMEMultipart("alternative")
-                        msg["Subject"] = subject
-                        msg["From"] = smtp_from
-                        msg["To"] = to
-                        msg.attach(MIMEText(body, "plain", "utf-8"))
-                        server.sendmail(smtp_from, [to], msg.as_string())
-                        logger.info("Email plugin: sent to %s", to)
-            return True
-        except Exception as e:
-            logger.exception("Email plugin: send failed: %s", e)
-            return False
-
-
-# Config-driven loading: module exports this instance
-plugin = EmailDeliveryPlugin()
+"""
+Email delivery plugin: read insights from InsightStore, send summary via SMTP.
+Batch-type: called once per pipeline run.
+"""
+import io
+import logging
+import os
+import smtplib
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any
+
+from src.delivery.interface import DeliveryPlugin
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_recipients(raw: str | list[str] | None) -> list[str]:
+    """Parse EMAIL_TO / email_to into list of addresses (comma-separated string or list)."""
+    if not raw:
+        return []
+    if isinstance(raw, list):
+        return [s.strip() for s in raw if s and s.strip()]
+    return [s.strip() for s in str(raw).split(",") if s.strip()]
+
+
+def _fmt_kv(kv: tuple[Any, Any]) -> str:
+    """One `key: value` fragment for dict rendering (module scope: no per-call closure)."""
+    return f"{kv[0]}: {_format_value(kv[1])}"
+
+
+def _format_value(v: Any) -> str:
+    """Format a single value for email: list -> join, str -> as is, dict -> one line summary."""
+    if isinstance(v, list):
+        return ", ".join(map(str, v)) if v else "-"
+    if isinstance(v, str):
+        return v or "-"
+    if isinstance(v, dict):
+        return "; ".join(map(_fmt_kv, v.items())) or "-"
+    return str(v) if v is not None else "-"
+
+# Label cache: insight keys come from a small vocabulary, so the
+# replace/strip normalization is done once per distinct key.
+_label_cache: dict[str, str] = {}
+
+
+def _label(key: str) -> str:
+    label = _label_cache.get(key)
+    if label is None:
+        label = _label_cache[key] = key.replace("_", " ").strip()
+    return label
+
+
+def _build_body(insights: list[Any], raw_store: Any | None = None) -> str:
+    """Build plain text email body from insights (flexible data structure)."""
+    # Resolve all links in one query instead of a SELECT per insight.
+    url_by_id: dict[int, str] = {}
+    if raw_store is not None:
+        ids = [ins.raw_item_id for ins in insights if getattr(ins, "raw_item_id", None)]
+        if ids:
+            url_by_id = raw_store.get_urls_by_ids(ids)
+    buf = io.StringIO()
+    w = buf.write
+    w("# AI 洞察 日报\n\n")
+    for i, ins in enumerate(insights, 1):
+        w(f"## 条目 {i}\n\n")
+        data = getattr(ins, "data", {}) or {}
+        for key, value in data.items():
+            w(f"- **{_label(key)}**: {_format_value(value)}\n\n")
+        url = url_by_id.get(getattr(ins, "raw_item_id", None))
+        if url:
+            w(f"- **链接**: {url}\n\n")
+        w("\n")
+    return buf.getvalue()
+
+
+class EmailDeliveryPlugin(DeliveryPlugin):
+    def __init__(self):
+        self._plugin_id = "email"
+
+    @property
+    def plugin_id(self) -> str:
+        return self._plugin_id
+
+    def deliver(
+        self,
+        insight_store: Any,
+        config: dict[str, Any] | None = None,
+        context: dict[str, Any] | None = None,
+    ) -> bool:
+        config = config or {}
+        context = context or {}
+        raw_store = context.get("raw_store")
+        smtp_host = os.getenv("SMTP_HOST") or config.get("smtp_host")
+        smtp_port = int(os.getenv("SMTP_PORT", "587") or config.get("smtp_port", "587"))
+        smtp_user = os.getenv("SMTP_USER") or config.get("smtp_user")
+        smtp_password = os.getenv("SMTP_PASSWORD") or config.get("smtp_password")
+        smtp_from = os.getenv("SMTP_FROM") or config.get("smtp_from") or smtp_user
+        email_to_raw = os.getenv("EMAIL_TO") or config.get("email_to")
+        recipients = _parse_recipients(email_to_raw)
+        subject_prefix = config.get("subject_prefix", "[AI 洞察]")
+        max_insights = int(config.get("max_insights", 100))
+        if not all([smtp_host, smtp_user, smtp_password]) or not recipients:
+            logger.warning("Email plugin: missing SMTP_HOST/USER/PASSWORD or EMAIL_TO")
+            return False
+        insights = insight_store.list_since(limit=max_insights)
+        if not insights:
+            logger.info("Email plugin: no insights to send")
+            return True
+        body = _build_body(insights, raw_store)
+        subject = f"{subject_prefix} 日报 {len(insights)} 条"
+        use_ssl = smtp_port == 465
+        # Build and serialize the MIME message once; all recipients go in a
+        # single envelope instead of re-encoding the body per recipient.
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = smtp_from
+        msg["To"] = ", ".join(recipients)
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+        msg_string = msg.as_string()
+        try:
+            # sendmail returns a dict of recipients the server refused; an
+            # empty dict means everyone in the envelope was accepted.
+            if use_ssl:
+                with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
+                    server.login(smtp_user, smtp_password)
+                    refused = server.sendmail(smtp_from, recipients, msg_string)
+            else:
+                with smtplib.SMTP(smtp_host, smtp_port) as server:
+                    server.starttls()
+                    server.login(smtp_user, smtp_password)
+                    refused = server.sendmail(smtp_from, recipients, msg_string)
+            if refused:
+                logger.warning(
+                    "Email plugin: %d/%d recipients refused: %s",
+                    len(refused), len(recipients),
+                    "; ".join(f"{addr} ({code} {resp!r})" for addr, (code, resp) in refused.items()),
+                )
+            accepted = [r for r in recipients if r not in refused]
+            if accepted:
+                logger.info("Email plugin: sent to %s", ", ".join(accepted))
+            return bool(accepted)
+        except Exception as e:
+            logger.exception("Email plugin: send failed: %s", e)
+            return False
+
+
+# Config-driven loading: module exports this instance
+plugin = EmailDeliveryPlugin()
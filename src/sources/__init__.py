@@ -1 +1 @@
-# Source adapters: arxiv (current), rss/hn (later)
+# Source adapters: arxiv (current), rss/hn (later)
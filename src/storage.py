@@ -1,204 +1,492 @@
-"""
-Storage layer: RawStore (raw items) and InsightStore (analyzed insights).
-Raw items: id, title, url, summary, source, fetched_at.
-Insights: id, raw_item_id, data (JSON blob, structure flexible), analyzed_at.
-"""
-import json
-import os
-import sqlite3
-from dataclasses import dataclass, field
-from datetime import datetime
-from pathlib import Path
-from typing import Any
-
-
-@dataclass
-class RawItem:
-    """Original entry from a source (e.g. arXiv)."""
-    id: int | None
-    title: str
-    url: str
-    summary: str
-    source: str
-    fetched_at: str  # ISO format
-
-
-@dataclass
-class Insight:
-    """Analyzed insight linked to a raw item. data is arbitrary JSON from the analyzer."""
-    id: int | None
-    raw_item_id: int
-    data: dict[str, Any]
-    analyzed_at: str  # ISO format
-
-
-def _ensure_dir(path: str) -> None:
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-
-
-# --- RawStore ---
-
-RAW_TABLE = """
-CREATE TABLE IF NOT EXISTS raw_items (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    title TEXT NOT NULL,
-    url TEXT NOT NULL,
-    summary TEXT NOT NULL,
-    source TEXT NOT NULL,
-    fetched_at TEXT NOT NULL,
-    UNIQUE(source, url)
-)
-"""
-
-
-class RawStore:
-    """Persists raw entries from sources. Unique key: (source, url)."""
-
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        _ensure_dir(db_path)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(RAW_TABLE)
-
-    def insert(self, title: str, url: str, summary: str, source: str) -> int | None:
-        """Insert one raw item. Returns id or None if duplicate (source, url)."""
-        fetched_at = datetime.utcnow().isoformat() + "Z"
-        with sqlite3.connect(self.db_path) as conn:
-            try:
-                cur = conn.execute(
-                    "INSERT INTO raw_items (title, url, summary, source, fetched_at) VALUES (?, ?, ?, ?, ?)",
-                    (title, url, summary, source, fetched_at),
-                )
-                conn.commit()
-                return cur.lastrowid
-            except sqlite3.IntegrityError:
-                return None
-
-    def insert_many(self, items: list[dict[str, Any]], source: str) -> int:
-        """Insert multiple items; skip duplicates. Returns count inserted."""
-        count = 0
-        for it in items:
-            if self.insert(
-                it.get("title", ""),
-                it.get("url", ""),
-                it.get("summary", ""),
-                source,
-            ):
-                count += 1
-        return count
-
-    def get_by_id(self, id: int) -> RawItem | None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute("SELECT * FROM raw_items WHERE id = ?", (id,)).fetchone()
-            if row is None:
-                return None
-            return RawItem(
-                id=row["id"],
-                title=row["title"],
-                url=row["url"],
-                summary=row["summary"],
-                source=row["source"],
-                fetched_at=row["fetched_at"],
-            )
-
-    def list_since(self, since_iso: str | None = None, limit: int = 500) -> list[RawItem]:
-        """List raw items, optionally since a given fetched_at (ISO)."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            if since_iso:
-                rows = conn.execute(
-                    "SELECT * FROM raw_items WHERE fetched_at >= ? ORDER BY fetched_at DESC LIMIT ?",
-                    (since_iso, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT * FROM raw_items ORDER BY fetched_at DESC LIMIT ?",
-                    (limit,),
-                ).fetchall()
-            return [
-                RawItem(
-                    id=r["id"],
-                    title=r["title"],
-                    url=r["url"],
-                    summary=r["summary"],
-                    source=r["source"],
-                    fetched_at=r["fetched_at"],
-                )
-                for r in rows
-            ]
-
-
-# --- InsightStore ---
-
-INSIGHT_TABLE = """
-CREATE TABLE IF NOT EXISTS insights (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    raw_item_id INTEGER NOT NULL,
-    data TEXT NOT NULL,
-    analyzed_at TEXT NOT NULL,
-    FOREIGN KEY (raw_item_id) REFERENCES raw_items(id)
-)
-"""
-
-
-class InsightStore:
-    """Persists analyzed insights. data is a flexible JSON object from the analyzer."""
-
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        _ensure_dir(db_path)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(INSIGHT_TABLE)
-
-    def insert(self, raw_item_id: int, data: dict[str, Any]) -> int:
-        analyzed_at = datetime.utcnow().isoformat() + "Z"
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(
-                "INSERT INTO insights (raw_item_id, data, analyzed_at) VALUES (?, ?, ?)",
-                (raw_item_id, json.dumps(data, ensure_ascii=False), analyzed_at),
-            )
-            conn.commit()
-            return cur.lastrowid
-
-    def get_analyzed_raw_item_ids(self) -> set[int]:
-        """Return set of raw_item_id that already have an insight (avoid re-analyzing)."""
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute("SELECT DISTINCT raw_item_id FROM insights").fetchall()
-            return {r[0] for r in rows}
-
-    def get_by_id(self, id: int) -> Insight | None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute("SELECT * FROM insights WHERE id = ?", (id,)).fetchone()
-            if row is None:
-                return None
-            return Insight(
-                id=row["id"],
-                raw_item_id=row["raw_item_id"],
-                data=json.loads(row["data"]),
-                analyzed_at=row["analyzed_at"],
-            )
-
-    def list_since(self, since_iso: str | None = None, limit: int = 500) -> list[Insight]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            if since_iso:
-                rows = conn.execute(
-                    "SELECT * FROM insights WHERE analyzed_at >= ? ORDER BY analyzed_at DESC LIMIT ?",
-                    (since_iso, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT * FROM insights ORDER BY analyzed_at DESC LIMIT ?",
-                    (limit,),
-                ).fetchall()
-            return [
-                Insight(
-                    id=r["id"],
-                    raw_item_id=r["raw_item_id"],
-                    data=json.loads(r["data"]),
-                    analyzed_at=r["analyzed_at"],
-                )
-                for r in rows
-            ]
+"""
+Storage layer: RawStore (raw items) and InsightStore (analyzed insights).
+Raw items: id, title, url, summary, source, fetched_at.
+Insights: id, raw_item_id, data (JSON blob, structure flexible), analyzed_at.
+Each store holds one persistent connection (guarded by a lock) instead of
+reconnecting per call, so the page cache stays warm across queries.
+"""
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(data: Any) -> str:
+    """Serialize insight payloads: orjson (C, compact) when available, stdlib otherwise.
+    Output stays str so the data column remains TEXT — no schema migration."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@dataclass
+class RawItem:
+    """Original entry from a source (e.g. arXiv)."""
+    id: int | None
+    title: str
+    url: str
+    summary: str
+    source: str
+    fetched_at: str  # ISO format
+
+
+@dataclass
+class Insight:
+    """Analyzed insight linked to a raw item. data is arbitrary JSON from the analyzer."""
+    id: int | None
+    raw_item_id: int
+    data: dict[str, Any]
+    analyzed_at: str  # ISO format
+
+
+def _ensure_dir(path: str) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+
+# Summaries dominate raw_items (up to 5000 chars each); compressing them packs
+# several times more rows per SQLite page, which speeds up the list_since scans.
+# A one-byte sentinel marks compressed values so legacy plain-text rows (and
+# short strings not worth compressing) still read back correctly.
+_SUMMARY_COMPRESSED = b"\x01"
+
+
+def _pack_summary(summary: str) -> bytes | str:
+    data = summary.encode("utf-8")
+    if len(data) < 256:
+        return summary  # compression header would outweigh the savings
+    return _SUMMARY_COMPRESSED + zlib.compress(data, 6)
+
+
+def _unpack_summary(value: bytes | str) -> str:
+    if isinstance(value, bytes):
+        if value.startswith(_SUMMARY_COMPRESSED):
+            return zlib.decompress(value[1:]).decode("utf-8")
+        return value.decode("utf-8")
+    return value
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time in the stored ISO format. Called once per write/batch —
+    datetime formatting is surprisingly costly, so batch paths must not call it per row."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    WAL journal + relaxed fsync: much faster batched writes and readers that
+    don't block on the fetcher's inserts. WAL persists in the DB file, but the
+    other PRAGMAs are per-connection, so this runs on every store init.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+
+
+# RETURNING needs SQLite >= 3.35; older system libraries (e.g. Ubuntu 20.04's
+# 3.31) get a changes()-count fallback on the write paths that use it.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open the store's persistent connection (shared across threads behind a lock)."""
+    # sqlite3's default per-connection statement cache (>= 100 entries) already
+    # covers every distinct query the stores issue, so hot reads skip SQL
+    # re-parsing after the first call — effective because the connection persists.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn)
+    return conn
+
+
+# --- RawStore ---
+
+RAW_TABLE = """
+CREATE TABLE IF NOT EXISTS raw_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    UNIQUE(source, url)
+)
+"""
+
+
+class RawStore:
+    """Persists raw entries from sources. Unique key: (source, url)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        _ensure_dir(db_path)
+        self._lock = threading.Lock()
+        self._conn = _connect(db_path)
+        with self._lock:
+            self._conn.execute(RAW_TABLE)
+            # Covers the ORDER BY fetched_at DESC in list_since/list_unanalyzed.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_raw_fetched ON raw_items(fetched_at DESC)"
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent connection (checkpoints WAL, releases the file handle)."""
+        self._conn.close()
+
+    def insert(self, title: str, url: str, summary: str, source: str) -> int | None:
+        """Insert one raw item. Returns id or None if duplicate (source, url)."""
+        fetched_at = _utcnow_iso()
+        params = (title, url, _pack_summary(summary), source, fetched_at)
+        with self._lock:
+            # OR IGNORE resolves the UNIQUE(source, url) conflict in one
+            # statement: duplicates yield no row instead of raising and rolling
+            # back. RETURNING gives the id directly; on older SQLite the
+            # changes() delta tells duplicate apart from insert (lastrowid is
+            # stale after an ignored insert, so it can't be checked directly).
+            if _HAS_RETURNING:
+                row = self._conn.execute(
+                    "INSERT OR IGNORE INTO raw_items (title, url, summary, source, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?) RETURNING id",
+                    params,
+                ).fetchone()
+                new_id = row["id"] if row is not None else None
+            else:
+                before = self._conn.total_changes
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO raw_items (title, url, summary, source, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    params,
+                )
+                new_id = cur.lastrowid if self._conn.total_changes > before else None
+            self._conn.commit()
+            return new_id
+
+    def insert_many(self, items: list[dict[str, Any]], source: str) -> int:
+        """Insert multiple items in one transaction; skip duplicates. Returns count inserted."""
+        if not items:
+            return 0
+        fetched_at = _utcnow_iso()
+        urls = [it.get("url", "") for it in items]
+        with self._lock:
+            # Pre-filter: on re-runs most of the batch already exists, so one
+            # SELECT spares N attempted writes (chunked for the variable limit).
+            existing: set[str] = set()
+            for i in range(0, len(urls), 500):
+                chunk = urls[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url FROM raw_items WHERE source = ? AND url IN ({placeholders})",
+                    [source, *chunk],
+                ).fetchall()
+                existing.update(r[0] for r in rows)
+            new_rows = [
+                (it.get("title", ""), it.get("url", ""), _pack_summary(it.get("summary", "")), source, fetched_at)
+                for it in items
+                if it.get("url", "") not in existing
+            ]
+            if not new_rows:
+                return 0
+            before = self._conn.total_changes
+            # OR IGNORE kept as a belt against in-batch duplicates.
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO raw_items (title, url, summary, source, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                new_rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def get_by_id(self, id: int) -> RawItem | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM raw_items WHERE id = ?", (id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return RawItem(
+            id=row["id"],
+            title=row["title"],
+            url=row["url"],
+            summary=_unpack_summary(row["summary"]),
+            source=row["source"],
+            fetched_at=row["fetched_at"],
+        )
+
+    def list_unanalyzed(self, limit: int = 500) -> list[RawItem]:
+        """
+        List raw items that have no insight yet, newest first. The filter runs
+        as a SQL anti-join; assumes raw_items and insights share one database
+        file (as wired in run_daily.py).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.* FROM raw_items r"
+                " LEFT JOIN insights i ON i.raw_item_id = r.id"
+                " WHERE i.id IS NULL"
+                " ORDER BY r.fetched_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            RawItem(
+                id=r["id"],
+                title=r["title"],
+                url=r["url"],
+                summary=_unpack_summary(r["summary"]),
+                source=r["source"],
+                fetched_at=r["fetched_at"],
+            )
+            for r in rows
+        ]
+
+    def get_urls_by_ids(self, ids: list[int]) -> dict[int, str]:
+        """Resolve many item ids to urls in one query (chunked to respect SQLite's variable limit)."""
+        out: dict[int, str] = {}
+        if not ids:
+            return out
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, url FROM raw_items WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                out.update(rows)
+        return out
+
+    def get_many(self, ids: Iterable[int]) -> dict[int, RawItem]:
+        """
+        Fetch many items by id in batched IN (...) queries instead of one
+        round-trip per id. Missing ids are simply absent from the result.
+        """
+        out: dict[int, RawItem] = {}
+        ids = list(ids)
+        if not ids:
+            return out
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT * FROM raw_items WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for r in rows:
+                    out[r["id"]] = RawItem(
+                        id=r["id"],
+                        title=r["title"],
+                        url=r["url"],
+                        summary=_unpack_summary(r["summary"]),
+                        source=r["source"],
+                        fetched_at=r["fetched_at"],
+                    )
+        return out
+
+    def iter_since(self, since_iso: str | None = None, limit: int = 500) -> Iterator[RawItem]:
+        """
+        Stream raw items, optionally since a given fetched_at (ISO), newest
+        first. Rows are fetched in chunks as the caller consumes them, so peak
+        memory stays O(chunk) instead of O(limit).
+        """
+        with self._lock:
+            if since_iso:
+                cur = self._conn.execute(
+                    "SELECT * FROM raw_items WHERE fetched_at >= ? ORDER BY fetched_at DESC LIMIT ?",
+                    (since_iso, limit),
+                )
+            else:
+                cur = self._conn.execute(
+                    "SELECT * FROM raw_items ORDER BY fetched_at DESC LIMIT ?",
+                    (limit,),
+                )
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(100)
+            if not rows:
+                return
+            for r in rows:
+                yield RawItem(
+                    id=r["id"],
+                    title=r["title"],
+                    url=r["url"],
+                    summary=_unpack_summary(r["summary"]),
+                    source=r["source"],
+                    fetched_at=r["fetched_at"],
+                )
+
+    def list_since(self, since_iso: str | None = None, limit: int = 500) -> list[RawItem]:
+        """List variant of iter_since for callers that need len()/indexing."""
+        return list(self.iter_since(since_iso=since_iso, limit=limit))
+
+
+# --- InsightStore ---
+
+INSIGHT_TABLE = """
+CREATE TABLE IF NOT EXISTS insights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    raw_item_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    analyzed_at TEXT NOT NULL,
+    FOREIGN KEY (raw_item_id) REFERENCES raw_items(id)
+)
+"""
+
+INSIGHT_HASH_TABLE = """
+CREATE TABLE IF NOT EXISTS insight_by_hash (
+    sha256 TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+)
+"""
+
+
+class InsightStore:
+    """Persists analyzed insights. data is a flexible JSON object from the analyzer."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        _ensure_dir(db_path)
+        self._lock = threading.Lock()
+        self._conn = _connect(db_path)
+        with self._lock:
+            self._conn.execute(INSIGHT_TABLE)
+            self._conn.execute(INSIGHT_HASH_TABLE)
+            # Backs the anti-join in RawStore.list_unanalyzed.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_insights_raw_item_id ON insights(raw_item_id)"
+            )
+            # Covers the ORDER BY analyzed_at DESC in list_since.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_insights_analyzed ON insights(analyzed_at DESC)"
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent connection (checkpoints WAL, releases the file handle)."""
+        self._conn.close()
+
+    def insert(self, raw_item_id: int, data: dict[str, Any]) -> int:
+        analyzed_at = _utcnow_iso()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO insights (raw_item_id, data, analyzed_at) VALUES (?, ?, ?)",
+                (raw_item_id, _json_dumps(data), analyzed_at),
+            )
+            self._conn.commit()
+            return cur.lastrowid
+
+    def insert_many(self, items: list[tuple[int, dict[str, Any]]]) -> list[int]:
+        """
+        Insert many (raw_item_id, data) rows in one transaction (single commit/fsync).
+        Returns the new row ids via INSERT ... RETURNING where available;
+        plain inserts never conflict here, so per-row lastrowid is a safe
+        fallback on older SQLite.
+        """
+        if not items:
+            return []
+        analyzed_at = _utcnow_iso()
+        ids: list[int] = []
+        with self._lock:
+            try:
+                for raw_item_id, data in items:
+                    params = (raw_item_id, _json_dumps(data), analyzed_at)
+                    if _HAS_RETURNING:
+                        row = self._conn.execute(
+                            "INSERT INTO insights (raw_item_id, data, analyzed_at) VALUES (?, ?, ?) RETURNING id",
+                            params,
+                        ).fetchone()
+                        ids.append(row[0])
+                    else:
+                        cur = self._conn.execute(
+                            "INSERT INTO insights (raw_item_id, data, analyzed_at) VALUES (?, ?, ?)",
+                            params,
+                        )
+                        ids.append(cur.lastrowid)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return ids
+
+    def get_data_by_hash(self, sha256: str) -> dict[str, Any] | None:
+        """Look up a cached analysis by input hash (None on miss)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM insight_by_hash WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        return _json_loads(row[0]) if row else None
+
+    def put_data_by_hash(self, sha256: str, data: dict[str, Any]) -> None:
+        """Record an analysis under its input hash (first write wins)."""
+        created_at = _utcnow_iso()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO insight_by_hash (sha256, data, created_at) VALUES (?, ?, ?)",
+                (sha256, _json_dumps(data), created_at),
+            )
+            self._conn.commit()
+
+    def get_analyzed_raw_item_ids(self) -> set[int]:
+        """Return set of raw_item_id that already have an insight (avoid re-analyzing)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT raw_item_id FROM insights").fetchall()
+        return {r[0] for r in rows}
+
+    def get_by_id(self, id: int) -> Insight | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM insights WHERE id = ?", (id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Insight(
+            id=row["id"],
+            raw_item_id=row["raw_item_id"],
+            data=_json_loads(row["data"]),
+            analyzed_at=row["analyzed_at"],
+        )
+
+    def iter_since(self, since_iso: str | None = None, limit: int = 500) -> Iterator[Insight]:
+        """Stream insights newest first; rows fetched in chunks as consumed (see RawStore.iter_since)."""
+        with self._lock:
+            if since_iso:
+                cur = self._conn.execute(
+                    "SELECT * FROM insights WHERE analyzed_at >= ? ORDER BY analyzed_at DESC LIMIT ?",
+                    (since_iso, limit),
+                )
+            else:
+                cur = self._conn.execute(
+                    "SELECT * FROM insights ORDER BY analyzed_at DESC LIMIT ?",
+                    (limit,),
+                )
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(100)
+            if not rows:
+                return
+            for r in rows:
+                yield Insight(
+                    id=r["id"],
+                    raw_item_id=r["raw_item_id"],
+                    data=_json_loads(r["data"]),
+                    analyzed_at=r["analyzed_at"],
+                )
+
+    def list_since(self, since_iso: str | None = None, limit: int = 500) -> list[Insight]:
+        """List variant of iter_since for callers that need len()/indexing."""
+        return list(self.iter_since(since_iso=since_iso, limit=limit))
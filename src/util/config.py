@@ -0,0 +1,27 @@
+"""
+Shared config loading: config.yaml is parsed once per process (lru_cache),
+using libyaml's C loader when the yaml package was built with it.
+"""
+import functools
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Project root = directory holding config.yaml / run_daily.py
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+@functools.lru_cache(maxsize=4)
+def load_config(config_path: str | None = None) -> dict[str, Any]:
+    """Load config.yaml (project root by default); parsed once per path."""
+    path = Path(config_path) if config_path else _ROOT / "config.yaml"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_SafeLoader) or {}
@@ -0,0 +1,64 @@
+"""
+Persistent LLM response cache: keyed on the full request (model, messages,
+temperature), stored in SQLite with a TTL. Repeated runs and dev loops hit
+the cache instead of re-paying the API call.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response_json TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL. Tracks hits/misses for run-level logging."""
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl_seconds: float = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(CACHE_TABLE)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(model: str, messages: list[dict[str, Any]], temperature: float) -> str:
+        """Stable SHA-256 over the request payload."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return cached response dict, or None on miss/expiry."""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT response_json, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < now:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, response: dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response_json, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(response, ensure_ascii=False), expires_at),
+            )
+            conn.commit()
@@ -0,0 +1,86 @@
+"""
+Client-side rate limiting for LLM calls.
+Sliding-window limiter enforcing both requests-per-minute and tokens-per-minute,
+so concurrent analyzer tasks throttle proactively instead of bursting into 429s.
+"""
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+
+_WINDOW_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class ProviderProfile:
+    """Default throttling limits for a known provider."""
+    rpm: int
+    tpm: int
+    max_concurrency: int
+
+
+# Seeded from published tier limits; matched against OPENAI_BASE_URL so
+# swapping providers doesn't silently keep OpenAI-shaped assumptions.
+PROVIDER_PROFILES: list[tuple[re.Pattern[str], ProviderProfile]] = [
+    (re.compile(r"api\.openai\.com"), ProviderProfile(rpm=3500, tpm=200_000, max_concurrency=10)),
+    (re.compile(r"api\.anthropic\.com"), ProviderProfile(rpm=50, tpm=80_000, max_concurrency=5)),
+    (re.compile(r"together"), ProviderProfile(rpm=600, tpm=1_000_000, max_concurrency=20)),
+    (re.compile(r"localhost|127\.0\.0\.1|ollama"), ProviderProfile(rpm=1000, tpm=10_000_000, max_concurrency=2)),
+]
+
+_DEFAULT_PROFILE = ProviderProfile(rpm=3500, tpm=200_000, max_concurrency=8)
+
+
+def detect_profile(base_url: str | None) -> ProviderProfile:
+    """Pick throttling defaults for base_url (OpenAI-shaped defaults if unknown)."""
+    if base_url:
+        for pattern, profile in PROVIDER_PROFILES:
+            if pattern.search(base_url):
+                return profile
+    return _DEFAULT_PROFILE
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token estimate for rate accounting (~4 chars per token)."""
+    return max(1, sum(len(t) for t in texts) // 4)
+
+
+class AsyncLeakyBucket:
+    """
+    Sliding-window RPM/TPM limiter for asyncio tasks.
+    acquire() blocks until both the request budget and the token budget
+    have room in the trailing 60s window.
+    """
+
+    def __init__(self, rpm: int = 3500, tpm: int = 200_000):
+        self.rpm = max(1, rpm)
+        self.tpm = max(1, tpm)
+        self._events: deque[tuple[float, int]] = deque()  # (timestamp, tokens)
+        self._lock = asyncio.Lock()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - _WINDOW_SECONDS
+        while self._events and self._events[0][0] <= cutoff:
+            self._events.popleft()
+
+    def _wait_needed(self, now: float, estimated_tokens: int) -> float:
+        """Seconds until the window has room for one request of estimated_tokens."""
+        self._prune(now)
+        if len(self._events) >= self.rpm:
+            return self._events[0][0] + _WINDOW_SECONDS - now
+        used = sum(t for _, t in self._events)
+        if used + estimated_tokens > self.tpm and self._events:
+            return self._events[0][0] + _WINDOW_SECONDS - now
+        return 0.0
+
+    async def acquire(self, estimated_tokens: int = 1) -> None:
+        """Block until a request of estimated_tokens fits the RPM/TPM window, then record it."""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                wait = self._wait_needed(now, estimated_tokens)
+                if wait <= 0:
+                    self._events.append((now, estimated_tokens))
+                    return
+            await asyncio.sleep(min(wait, _WINDOW_SECONDS))
@@ -1 +1 @@
-# Tests
+# Tests
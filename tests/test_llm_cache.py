@@ -0,0 +1,55 @@
+"""Verify LLMCache: stable keys, hit/miss accounting, TTL expiry."""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.util.llm_cache import LLMCache
+
+_MESSAGES = [
+    {"role": "system", "content": "你是分析助手"},
+    {"role": "user", "content": "Title: X"},
+]
+
+
+def test_cache_key_stable():
+    k1 = LLMCache.cache_key("gpt-4o-mini", _MESSAGES, 0.3)
+    k2 = LLMCache.cache_key("gpt-4o-mini", list(_MESSAGES), 0.3)
+    assert k1 == k2  # same request -> same key
+    assert k1 != LLMCache.cache_key("gpt-4o-mini", _MESSAGES, 0.7)
+    assert k1 != LLMCache.cache_key("other-model", _MESSAGES, 0.3)
+
+
+def test_hit_miss_and_ttl():
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_llm_cache.db")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    try:
+        cache = LLMCache(db_path=path, ttl_seconds=3600)
+        key = LLMCache.cache_key("gpt-4o-mini", _MESSAGES, 0.3)
+        assert cache.get(key) is None
+        assert cache.misses == 1 and cache.hits == 0
+        cache.set(key, {"content": '{"a": 1}'})
+        assert cache.get(key) == {"content": '{"a": 1}'}
+        assert cache.hits == 1
+        # Expired entries behave like misses (negative TTL: expires in the past).
+        expired = LLMCache(db_path=path, ttl_seconds=-1)
+        expired.set(key, {"content": "stale"})
+        assert expired.get(key) is None
+        assert expired.misses == 1
+    finally:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    test_cache_key_stable()
+    print("LLMCache keys OK")
+    test_hit_miss_and_ttl()
+    print("LLMCache hit/miss/TTL OK")
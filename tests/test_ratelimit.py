@@ -0,0 +1,75 @@
+"""Verify rate limiting: token estimate, provider profiles, limiter blocking."""
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.util.ratelimit as ratelimit
+from src.util.ratelimit import AsyncLeakyBucket, detect_profile, estimate_tokens
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1  # never zero: every request costs something
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("ab", "cd") == 1
+
+
+def test_detect_profile():
+    assert detect_profile("https://api.openai.com/v1").rpm == 3500
+    assert detect_profile("https://api.anthropic.com").rpm == 50
+    assert detect_profile("http://localhost:11434/v1").max_concurrency == 2
+    assert detect_profile(None) is ratelimit._DEFAULT_PROFILE
+    assert detect_profile("https://unknown.example.com") is ratelimit._DEFAULT_PROFILE
+
+
+def test_limiter_blocks_when_window_full():
+    async def run() -> tuple[float, float]:
+        bucket = AsyncLeakyBucket(rpm=2, tpm=1_000_000)
+        t0 = time.monotonic()
+        await bucket.acquire(1)
+        await bucket.acquire(1)
+        free = time.monotonic() - t0
+        # Third request exceeds rpm=2: must wait for the window to slide.
+        t1 = time.monotonic()
+        await bucket.acquire(1)
+        blocked = time.monotonic() - t1
+        return free, blocked
+
+    # Shrink the window so the blocking path runs in milliseconds.
+    original = ratelimit._WINDOW_SECONDS
+    ratelimit._WINDOW_SECONDS = 0.2
+    try:
+        free, blocked = asyncio.run(run())
+    finally:
+        ratelimit._WINDOW_SECONDS = original
+    assert free < 0.1  # within budget: no waiting
+    assert blocked >= 0.1  # over budget: waited for the window
+
+
+def test_limiter_blocks_on_token_budget():
+    async def run() -> float:
+        bucket = AsyncLeakyBucket(rpm=100, tpm=10)
+        await bucket.acquire(8)
+        t0 = time.monotonic()
+        await bucket.acquire(8)  # 16 > tpm=10: must wait
+        return time.monotonic() - t0
+
+    original = ratelimit._WINDOW_SECONDS
+    ratelimit._WINDOW_SECONDS = 0.2
+    try:
+        blocked = asyncio.run(run())
+    finally:
+        ratelimit._WINDOW_SECONDS = original
+    assert blocked >= 0.1
+
+
+if __name__ == "__main__":
+    test_estimate_tokens()
+    print("estimate_tokens OK")
+    test_detect_profile()
+    print("detect_profile OK")
+    test_limiter_blocks_when_window_full()
+    print("limiter RPM blocking OK")
+    test_limiter_blocks_on_token_budget()
+    print("limiter TPM blocking OK")
@@ -1,66 +1,140 @@
-"""Verify RawStore and InsightStore: init, write, read."""
-import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from src.storage import RawStore, InsightStore, RawItem, Insight
-
-
-def test_raw_store():
-    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_raw.db")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    if os.path.exists(path):
-        try:
-            os.remove(path)
-        except OSError:
-            pass
-    try:
-        store = RawStore(path)
-        id1 = store.insert("Title A", "https://a.org/1", "Summary A", "arxiv")
-        assert id1 is not None
-        id2 = store.insert("Title A", "https://a.org/1", "Summary A", "arxiv")
-        assert id2 is None  # duplicate
-        id3 = store.insert("Title B", "https://b.org/2", "Summary B", "arxiv")
-        assert id3 is not None
-        row = store.get_by_id(id1)
-        assert row is not None and row.title == "Title A" and row.source == "arxiv"
-        rows = store.list_since(limit=10)
-        assert len(rows) >= 2
-    finally:
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-        except OSError:
-            pass  # Windows may hold file handle
-
-
-def test_insight_store():
-    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_insight.db")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    if os.path.exists(path):
-        try:
-            os.remove(path)
-        except OSError:
-            pass
-    try:
-        store = InsightStore(path)
-        data = {"summary": "简要总结", "innovations": ["创新1"], "commercial_plan": ["计划1"]}
-        pk = store.insert(1, data)
-        assert pk is not None
-        row = store.get_by_id(pk)
-        assert row is not None and row.raw_item_id == 1 and row.data == data
-        rows = store.list_since(limit=10)
-        assert len(rows) >= 1
-    finally:
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-        except OSError:
-            pass  # Windows may hold file handle
-
-
-if __name__ == "__main__":
-    test_raw_store()
-    print("RawStore OK")
-    test_insight_store()
-    print("InsightStore OK")
+"""Verify RawStore and InsightStore: init, write, read."""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.storage import RawStore, InsightStore, RawItem, Insight
+
+
+def test_raw_store():
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_raw.db")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    try:
+        store = RawStore(path)
+        id1 = store.insert("Title A", "https://a.org/1", "Summary A", "arxiv")
+        assert id1 is not None
+        id2 = store.insert("Title A", "https://a.org/1", "Summary A", "arxiv")
+        assert id2 is None  # duplicate
+        id3 = store.insert("Title B", "https://b.org/2", "Summary B", "arxiv")
+        assert id3 is not None
+        row = store.get_by_id(id1)
+        assert row is not None and row.title == "Title A" and row.source == "arxiv"
+        rows = store.list_since(limit=10)
+        assert len(rows) >= 2
+    finally:
+        store.close()
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def test_raw_store_get_many():
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_raw_many.db")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    try:
+        store = RawStore(path)
+        ids = [
+            store.insert(f"Title {i}", f"https://a.org/{i}", f"Summary {i}", "arxiv")
+            for i in range(3)
+        ]
+        items = store.get_many(ids + [999999])  # unknown ids are simply absent
+        assert set(items) == set(ids)
+        assert items[ids[0]].title == "Title 0" and items[ids[2]].summary == "Summary 2"
+        assert store.get_many([]) == {}
+    finally:
+        store.close()
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def test_raw_store_summary_compression():
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_raw_zlib.db")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    try:
+        store = RawStore(path)
+        long_summary = "An abstract sentence about transformers. " * 100
+        rid = store.insert("Long", "https://a.org/long", long_summary, "arxiv")
+        assert store.get_by_id(rid).summary == long_summary
+        assert store.list_since(limit=10)[0].summary == long_summary
+        # On disk it is a sentinel-prefixed compressed blob, much smaller.
+        stored = store._conn.execute(
+            "SELECT summary FROM raw_items WHERE id = ?", (rid,)
+        ).fetchone()[0]
+        assert isinstance(stored, bytes) and stored[:1] == b"\x01"
+        assert len(stored) < len(long_summary)
+        # Short summaries stay plain text (compression not worth it).
+        sid = store.insert("Short", "https://a.org/short", "tiny", "arxiv")
+        assert store.get_by_id(sid).summary == "tiny"
+        # Legacy plain-text rows (written before compression) read back as-is.
+        store._conn.execute(
+            "INSERT INTO raw_items (title, url, summary, source, fetched_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            ("Legacy", "https://a.org/legacy", long_summary, "arxiv", "2024-01-01T00:00:00Z"),
+        )
+        store._conn.commit()
+        legacy = [r for r in store.list_since(limit=10) if r.title == "Legacy"]
+        assert legacy and legacy[0].summary == long_summary
+    finally:
+        store.close()
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def test_insight_store():
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "_test_insight.db")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    try:
+        store = InsightStore(path)
+        data = {"summary": "简要总结", "innovations": ["创新1"], "commercial_plan": ["计划1"]}
+        pk = store.insert(1, data)
+        assert pk is not None
+        row = store.get_by_id(pk)
+        assert row is not None and row.raw_item_id == 1 and row.data == data
+        rows = store.list_since(limit=10)
+        assert len(rows) >= 1
+    finally:
+        store.close()
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    test_raw_store()
+    print("RawStore OK")
+    test_raw_store_get_many()
+    print("RawStore.get_many OK")
+    test_raw_store_summary_compression()
+    print("RawStore compression OK")
+    test_insight_store()
+    print("InsightStore OK")